@@ -1,11 +1,18 @@
 import csv
+import io
 from dataclasses import dataclass
 from typing import Tuple
 
 from django.db import transaction
+from django.db.models import OuterRef, Subquery
 
 from .models import Exercise, WorkoutPlan, WorkoutPlanItem
 
+try:
+    import cisv  # optional SIMD-accelerated CSV parser
+except ImportError:
+    cisv = None
+
 
 @dataclass
 class ImportResult:
@@ -19,9 +26,11 @@ def _parse_sets(value: str) -> int:
     Parses Sets value (e.g. '3' or '1-2') and returns an integer.
     For ranges, returns the max (e.g. '1-2' -> 2).
     """
-    s = (value or "").strip()
+    s = value.strip() if value else ""
     if not s:
         return 1
+    if s.isdigit():
+        return int(s)  # fast path for the common single-number case
     if "-" in s:
         parts = [p.strip() for p in s.split("-") if p.strip()]
         nums = [int(p) for p in parts]
@@ -29,6 +38,23 @@ def _parse_sets(value: str) -> int:
     return int(s)
 
 
+def _read_csv_rows(csv_file):
+    """
+    Returns an iterator over CSV rows (lists of strings), header first.
+    Uploads Django has written to disk go through cisv if it is installed;
+    everything else is decoded and parsed incrementally with the stdlib csv module.
+    """
+    # Only uploads larger than FILE_UPLOAD_MAX_MEMORY_SIZE (2.5 MiB by default) get a
+    # temporary file path, so that setting is the effective cutoff for cisv.
+    # Tradeoff: parse_file returns every row at once, so memory use grows with the
+    # file size, unlike the streaming stdlib path below.
+    if cisv is not None and hasattr(csv_file, "temporary_file_path"):
+        return iter(cisv.parse_file(csv_file.temporary_file_path(), trim=True, skip_empty_lines=True))
+
+    stream = io.TextIOWrapper(csv_file, encoding="utf-8-sig", newline="")
+    return csv.reader(stream)
+
+
 @transaction.atomic
 def import_plan_items_from_csv(plan: WorkoutPlan, csv_file) -> ImportResult:
     """
@@ -36,61 +62,93 @@ def import_plan_items_from_csv(plan: WorkoutPlan, csv_file) -> ImportResult:
     Creates Exercises if missing, updates YouTube URL if changed,
     and creates WorkoutPlanItem rows in CSV order.
     """
-    decoded = csv_file.read().decode("utf-8-sig").splitlines()
-    reader = csv.DictReader(decoded)
+    reader = _read_csv_rows(csv_file)
+    header = [name.lstrip("\ufeff") for name in next(reader, [])]
 
     required = {"Exercise", "Sets", "Reps_or_Time", "Rest_Seconds", "YouTube_URL"}
-    if not required.issubset(set(reader.fieldnames or [])):
-        missing = required - set(reader.fieldnames or [])
+    if not required.issubset(header):
+        missing = required - set(header)
         raise ValueError(f"Missing required CSV columns: {', '.join(sorted(missing))}")
 
-    created_exercises = 0
-    updated_exercises = 0
-    created_items = 0
+    # Rows are plain lists; look columns up by their position in the header
+    idx = {name: header.index(name) for name in required}
+    width = len(header)
 
     # Optional: wipe existing items for that plan before importing
     WorkoutPlanItem.objects.filter(plan=plan).delete()
 
-    order = 1
+    # First pass: keep non-blank rows and remember the latest YouTube URL per exercise
+    rows = []
+    url_map = {}
     for row in reader:
-        name = (row.get("Exercise") or "").strip()
-        youtube_url = (row.get("YouTube_URL") or "").strip()
-        reps_or_time = (row.get("Reps_or_Time") or "").strip()
-        rest_seconds_raw = (row.get("Rest_Seconds") or "").strip()
-        sets_raw = (row.get("Sets") or "").strip()
-
+        if len(row) < width:
+            row = list(row) + [""] * (width - len(row))  # pad short rows
+        name = row[idx["Exercise"]].strip()
         if not name:
             continue  # skip blank lines
+        rows.append(row)
+        youtube_url = row[idx["YouTube_URL"]].strip()
+        if youtube_url or name not in url_map:
+            url_map[name] = youtube_url
+
+    # Resolve all exercises with one SELECT, then create/update them in bulk
+    exercises = {e.name: e for e in Exercise.objects.filter(name__in=url_map.keys())}
+
+    new_exercises = [
+        Exercise(name=name, youtube_url=url_map[name])
+        for name in url_map
+        if name not in exercises
+    ]
+    Exercise.objects.bulk_create(new_exercises)
+    exercises.update((e.name, e) for e in new_exercises)
+
+    # Update YouTube URL if changed and provided
+    to_update = []
+    for name, youtube_url in url_map.items():
+        exercise = exercises[name]
+        if youtube_url and exercise.youtube_url != youtube_url:
+            exercise.youtube_url = youtube_url
+            to_update.append(exercise)
+    Exercise.objects.bulk_update(to_update, ["youtube_url"], batch_size=500)
+    if to_update:
+        # bulk_update skips Exercise.save(), so refresh the URL copied onto plan items here
+        WorkoutPlanItem.objects.filter(exercise__in=to_update).update(
+            exercise_youtube_url=Subquery(
+                Exercise.objects.filter(pk=OuterRef("exercise_id")).values("youtube_url")[:1]
+            )
+        )
+
+    new_items = []
+    order = 1
+    for row in rows:
+        name = row[idx["Exercise"]].strip()
+        reps_or_time = row[idx["Reps_or_Time"]].strip()
+        rest_seconds_raw = row[idx["Rest_Seconds"]].strip()
+        sets_raw = row[idx["Sets"]].strip()
 
         prescribed_sets = _parse_sets(sets_raw)
         rest_seconds = int(rest_seconds_raw) if rest_seconds_raw else 0
 
-        exercise, created = Exercise.objects.get_or_create(
-            name=name,
-            defaults={"youtube_url": youtube_url},
-        )
-        if created:
-            created_exercises += 1
-        else:
-            # Update YouTube URL if changed and provided
-            if youtube_url and exercise.youtube_url != youtube_url:
-                exercise.youtube_url = youtube_url
-                exercise.save(update_fields=["youtube_url"])
-                updated_exercises += 1
-
-        WorkoutPlanItem.objects.create(
-            plan=plan,
-            exercise=exercise,
-            order=order,
-            prescribed_sets=prescribed_sets,
-            prescribed_reps=reps_or_time or "10",
-            rest_seconds=rest_seconds,
+        new_items.append(
+            WorkoutPlanItem(
+                plan=plan,
+                exercise=exercises[name],
+                exercise_name=name,
+                exercise_youtube_url=exercises[name].youtube_url,
+                order=order,
+                prescribed_sets=prescribed_sets,
+                prescribed_reps=reps_or_time or "10",
+                rest_seconds=rest_seconds,
+            )
         )
-        created_items += 1
         order += 1
 
+    # Insert all items in a few round-trips instead of one per row
+    WorkoutPlanItem.objects.bulk_create(new_items, batch_size=500)
+    created_items = len(new_items)
+
     return ImportResult(
-        created_exercises=created_exercises,
-        updated_exercises=updated_exercises,
+        created_exercises=len(new_exercises),
+        updated_exercises=len(to_update),
         created_items=created_items,
     )
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-15 12:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_exercise_copies(apps, schema_editor):
+    Exercise = apps.get_model('workouts', 'Exercise')
+    WorkoutPlanItem = apps.get_model('workouts', 'WorkoutPlanItem')
+    exercise = Exercise.objects.filter(pk=OuterRef('exercise_id'))
+    WorkoutPlanItem.objects.update(
+        exercise_name=Subquery(exercise.values('name')[:1]),
+        exercise_youtube_url=Subquery(exercise.values('youtube_url')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workoutplanitem',
+            name='exercise_name',
+            field=models.CharField(default='', editable=False, max_length=120),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='workoutplanitem',
+            name='exercise_youtube_url',
+            field=models.URLField(default='', editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_exercise_copies, migrations.RunPython.noop),
+    ]
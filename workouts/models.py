@@ -12,6 +12,33 @@ class Exercise(models.Model):
     youtube_url = models.URLField()
     notes = models.TextField(blank=True)
 
+    # Fields copied onto WorkoutPlanItem: {item field: exercise field}
+    ITEM_COPIES = {"exercise_name": "name", "exercise_youtube_url": "youtube_url"}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember loaded values so save() can tell which copied fields changed
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # Keep the copies on plan items in sync, but only for fields that actually changed
+        loaded = getattr(self, "_loaded_values", {})
+        update_fields = kwargs.get("update_fields")
+        changes = {
+            item_field: getattr(self, field)
+            for item_field, field in self.ITEM_COPIES.items()
+            if field in loaded
+            and loaded[field] != getattr(self, field)
+            and (update_fields is None or field in update_fields)
+        }
+        if changes:
+            WorkoutPlanItem.objects.filter(exercise=self).update(**changes)
+            loaded.update((field, getattr(self, field)) for field in self.ITEM_COPIES.values())
+
     # Human-readable name shown in admin and logs
     def __str__(self):
         return self.name
@@ -57,6 +84,10 @@ class WorkoutPlanItem(models.Model):
         on_delete=models.PROTECT
     )
 
+    # Copies of exercise.name / exercise.youtube_url so rendering/logging doesn't need a JOIN
+    exercise_name = models.CharField(max_length=120, editable=False)
+    exercise_youtube_url = models.URLField(editable=False)
+
     # Order of the exercise in the workout (1..7)
     order = models.PositiveSmallIntegerField(default=1)
 
@@ -75,8 +106,13 @@ class WorkoutPlanItem(models.Model):
         # Ensures exercises appear in correct order
         ordering = ["order"]
 
+    def save(self, *args, **kwargs):
+        self.exercise_name = self.exercise.name
+        self.exercise_youtube_url = self.exercise.youtube_url
+        super().save(*args, **kwargs)
+
     def __str__(self):
-        return f"{self.plan.date}: {self.exercise.name}"
+        return f"{self.plan.date}: {self.exercise_name}"
 
 
 # -------------------------
@@ -147,4 +183,4 @@ class SetLog(models.Model):
         ordering = ["plan_item__order", "set_number"]
 
     def __str__(self):
-        return f"{self.plan_item.exercise.name} - set {self.set_number}: {self.reps_done}"
+        return f"{self.plan_item.exercise_name} - set {self.set_number}: {self.reps_done}"
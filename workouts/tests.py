@@ -1,3 +1,219 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .importers import import_plan_items_from_csv
+from .models import Exercise, SetLog, WorkoutLog, WorkoutPlan, WorkoutPlanItem
+
+
+HEADER = "Exercise,Sets,Reps_or_Time,Rest_Seconds,YouTube_URL\n"
+
+
+def _csv_upload(text: str, bom: bool = False) -> SimpleUploadedFile:
+    """Builds an uploaded CSV file like the admin form would receive."""
+    data = text.encode("utf-8")
+    if bom:
+        data = b"\xef\xbb\xbf" + data
+    return SimpleUploadedFile("plan.csv", data, content_type="text/csv")
+
+
+class ImportPlanItemsFromCsvTests(TestCase):
+    """Tests for the bulk CSV importer."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("coach", password="pw")
+        self.plan = WorkoutPlan.objects.create(date=datetime.date(2025, 3, 20), created_by=self.user)
+
+    def test_imports_rows_in_order_and_reports_counts(self):
+        Exercise.objects.create(name="Plank", youtube_url="https://example.com/old-plank")
+        Exercise.objects.create(name="Cat Cow", youtube_url="https://example.com/cat-cow")
+        csv_text = HEADER + (
+            "Squat,3,10 reps,60,\n"
+            "\n"
+            ",,,,\n"
+            "Plank,2,60 seconds,45,https://example.com/plank\n"
+            "Cat Cow,1,8 reps,0,https://example.com/cat-cow\n"
+            "Squat,1-2,12 reps,90,https://example.com/squat\n"
+            "Hammer curl,2\n"
+        )
+
+        result = import_plan_items_from_csv(self.plan, _csv_upload(csv_text, bom=True))
+
+        # Counts are per exercise: Squat and Hammer curl are new, only Plank's URL changed
+        self.assertEqual(result.created_exercises, 2)
+        self.assertEqual(result.updated_exercises, 1)
+        self.assertEqual(result.created_items, 5)
+
+        items = list(self.plan.items.select_related("exercise"))
+        self.assertEqual(
+            [(i.order, i.exercise.name, i.prescribed_sets, i.prescribed_reps, i.rest_seconds) for i in items],
+            [
+                (1, "Squat", 3, "10 reps", 60),
+                (2, "Plank", 2, "60 seconds", 45),
+                (3, "Cat Cow", 1, "8 reps", 0),
+                (4, "Squat", 2, "12 reps", 90),
+                (5, "Hammer curl", 2, "10", 0),
+            ],
+        )
+
+        # A URL given only on a later row of a duplicate exercise is still used
+        self.assertEqual(Exercise.objects.get(name="Squat").youtube_url, "https://example.com/squat")
+        self.assertEqual(Exercise.objects.get(name="Plank").youtube_url, "https://example.com/plank")
+        self.assertEqual(Exercise.objects.get(name="Hammer curl").youtube_url, "")
+
+    def test_reimport_replaces_items_without_touching_exercises(self):
+        csv_text = HEADER + "Squat,3,10 reps,60,https://example.com/squat\n"
+        import_plan_items_from_csv(self.plan, _csv_upload(csv_text))
+
+        result = import_plan_items_from_csv(self.plan, _csv_upload(csv_text))
+
+        self.assertEqual((result.created_exercises, result.updated_exercises, result.created_items), (0, 0, 1))
+        self.assertEqual(self.plan.items.count(), 1)
+
+    def test_url_update_reaches_items_in_other_plans(self):
+        import_plan_items_from_csv(self.plan, _csv_upload(HEADER + "Squat,3,10,60,https://example.com/old\n"))
+        other_plan = WorkoutPlan.objects.create(date=datetime.date(2025, 3, 21), created_by=self.user)
+
+        import_plan_items_from_csv(other_plan, _csv_upload(HEADER + "Squat,3,10,60,https://example.com/new\n"))
+
+        self.assertEqual(self.plan.items.get().exercise_youtube_url, "https://example.com/new")
+
+    def test_missing_columns_raise(self):
+        with self.assertRaisesMessage(ValueError, "Missing required CSV columns: Rest_Seconds, YouTube_URL"):
+            import_plan_items_from_csv(self.plan, _csv_upload("Exercise,Sets,Reps_or_Time\nSquat,3,10\n"))
+
+
+class TodayWorkoutSubmitTests(TestCase):
+    """Tests for saving reps on the today_workout page."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("athlete", password="pw")
+        self.client.force_login(self.user)
+        plan = WorkoutPlan.objects.create(date=timezone.localdate(), created_by=self.user)
+        squat = Exercise.objects.create(name="Squat", youtube_url="https://example.com/squat")
+        plank = Exercise.objects.create(name="Plank", youtube_url="https://example.com/plank")
+        self.squat = WorkoutPlanItem.objects.create(plan=plan, exercise=squat, order=1, prescribed_sets=2)
+        self.plank = WorkoutPlanItem.objects.create(plan=plan, exercise=plank, order=2, prescribed_sets=1)
+        self.url = reverse("today_workout")
+        self.form = {
+            "general_comment": "Felt strong",
+            f"reps_{self.squat.id}_1": "10",
+            f"comment_{self.squat.id}_1": "easy",
+            f"reps_{self.squat.id}_2": "8",
+            f"reps_{self.plank.id}_1": "60",
+        }
+
+    def _saved_sets(self):
+        return {
+            (s.plan_item_id, s.set_number): (s.reps_done, s.comment)
+            for s in SetLog.objects.filter(log__user=self.user)
+        }
+
+    def test_first_submit_creates_log_and_sets(self):
+        response = self.client.post(self.url, self.form)
+
+        self.assertRedirects(response, self.url)
+        self.assertEqual(WorkoutLog.objects.get(user=self.user).general_comment, "Felt strong")
+        self.assertEqual(
+            self._saved_sets(),
+            {
+                (self.squat.id, 1): (10, "easy"),
+                (self.squat.id, 2): (8, ""),
+                (self.plank.id, 1): (60, ""),
+            },
+        )
+
+    def test_resubmit_updates_sets_in_place_and_drops_cleared_ones(self):
+        self.client.post(self.url, self.form)
+        kept = SetLog.objects.get(plan_item=self.squat, set_number=1)
+
+        form = dict(self.form, general_comment="Harder today")
+        form[f"reps_{self.squat.id}_1"] = "12"
+        form[f"reps_{self.squat.id}_2"] = ""
+        self.client.post(self.url, form)
+
+        self.assertEqual(WorkoutLog.objects.get(user=self.user).general_comment, "Harder today")
+        self.assertEqual(
+            self._saved_sets(),
+            {(self.squat.id, 1): (12, "easy"), (self.plank.id, 1): (60, "")},
+        )
+        # The upsert keeps the existing row rather than recreating it
+        self.assertEqual(SetLog.objects.get(plan_item=self.squat, set_number=1).pk, kept.pk)
+
+    def test_invalid_reps_leave_saved_workout_unchanged(self):
+        self.client.post(self.url, self.form)
+        before = self._saved_sets()
+
+        form = dict(self.form, general_comment="Should not be saved")
+        form[f"reps_{self.squat.id}_1"] = "15"
+        form[f"reps_{self.plank.id}_1"] = "a minute"
+        response = self.client.post(self.url, form, follow=True)
+
+        self.assertContains(response, "Invalid reps/time value &#x27;a minute&#x27; for Plank set 1.")
+        self.assertEqual(WorkoutLog.objects.get(user=self.user).general_comment, "Felt strong")
+        self.assertEqual(self._saved_sets(), before)
+
+    def test_invalid_reps_on_first_submit_create_no_log(self):
+        form = dict(self.form)
+        form[f"reps_{self.squat.id}_2"] = "eight"
+        self.client.post(self.url, form)
+
+        self.assertFalse(WorkoutLog.objects.filter(user=self.user).exists())
+
+    def test_stale_item_ids_are_rejected(self):
+        # A form rendered before the plan's items were replaced (e.g. by a CSV re-import)
+        stale_form = {"general_comment": "Old page", f"reps_{self.plank.id + 100}_1": "10"}
+        response = self.client.post(self.url, stale_form, follow=True)
+
+        self.assertContains(response, "Today&#x27;s workout plan changed while you were filling it in.")
+        self.assertNotContains(response, "Workout saved successfully!")
+        self.assertFalse(WorkoutLog.objects.filter(user=self.user).exists())
+
+
+class ExerciseCopySyncTests(TestCase):
+    """Tests for keeping the exercise name/URL copied onto plan items in sync."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("athlete", password="pw")
+        self.client.force_login(self.user)
+        plan = WorkoutPlan.objects.create(date=timezone.localdate(), created_by=self.user)
+        exercise = Exercise.objects.create(name="Squat", youtube_url="https://example.com/squat")
+        self.item = WorkoutPlanItem.objects.create(plan=plan, exercise=exercise, order=1)
+        self.exercise = Exercise.objects.get(pk=exercise.pk)
+
+    def _item_updates(self, queries):
+        return [q for q in queries if q["sql"].startswith('UPDATE "workouts_workoutplanitem"')]
+
+    def test_rename_updates_items_and_page(self):
+        self.exercise.name = "Back squat"
+        self.exercise.youtube_url = "https://example.com/back-squat"
+        self.exercise.save()
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.exercise_name, "Back squat")
+        self.assertEqual(self.item.exercise_youtube_url, "https://example.com/back-squat")
+        response = self.client.get(reverse("today_workout"))
+        self.assertContains(response, "Back squat")
+        self.assertContains(response, "https://example.com/back-squat")
+
+    def test_unchanged_or_excluded_fields_do_not_touch_items(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.exercise.save()
+            self.exercise.name = "Back squat"
+            self.exercise.save(update_fields=["notes"])
+            Exercise.objects.create(name="Plank", youtube_url="https://example.com/plank")
+
+        self.assertEqual(self._item_updates(queries.captured_queries), [])
+
+    def test_page_renders_without_joining_exercise(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("today_workout"))
 
-# Create your tests here.
+        self.assertContains(response, "Squat")
+        self.assertFalse(any("workouts_exercise" in q["sql"] for q in queries.captured_queries))
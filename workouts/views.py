@@ -1,5 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import redirect, render
 from django.utils import timezone
 
@@ -15,34 +17,49 @@ def today_workout(request):
     """
     today = timezone.localdate()
 
-    # Get the plan for today's date (admin creates plans manually)
-    plan = WorkoutPlan.objects.filter(date=today).first()
+    # Get the plan for today's date (admin creates plans manually).
+    # For rendering, fetch its items along with it (exercise name/URL are copied onto items).
+    plans = WorkoutPlan.objects.filter(date=today)
+    if request.method != "POST":
+        plans = plans.prefetch_related(
+            Prefetch("items", queryset=WorkoutPlanItem.objects.order_by("order"))
+        )
+    plan = plans.first()
     if not plan:
         return render(request, "workouts/today.html", {"today": today, "plan": None})
 
-    # Items are the exercises inside the plan, ordered by 'order'
-    items = WorkoutPlanItem.objects.select_related("exercise").filter(plan=plan)
-
     # Get existing log if user already submitted today
     log = WorkoutLog.objects.filter(user=request.user, plan=plan).first()
 
     if request.method == "POST":
-        # Create the log if it's the first submission
-        if not log:
-            log = WorkoutLog.objects.create(user=request.user, plan=plan)
-
-        # Save general comment for the whole workout
-        log.general_comment = request.POST.get("general_comment", "").strip()
-        log.save(update_fields=["general_comment"])
-
-        # For simplicity: on each submit, replace previous set logs for this plan
-        SetLog.objects.filter(log=log).delete()
-
-        # For each plan item, read reps for each set (reps_<itemid>_<setnum>)
-        for item in items:
-            for set_num in range(1, item.prescribed_sets + 1):
-                reps_key = f"reps_{item.id}_{set_num}"
-                comment_key = f"comment_{item.id}_{set_num}"
+        # Only the item id, set count and exercise name are needed to read the form
+        items_data = list(
+            WorkoutPlanItem.objects.filter(plan=plan).values_list(
+                "id", "prescribed_sets", "exercise_name"
+            )
+        )
+
+        # Reject forms rendered from an older version of the plan (e.g. re-imported since),
+        # otherwise none of their fields would match and nothing would be saved
+        item_ids = {str(item_id) for item_id, _, _ in items_data}
+        submitted_ids = {key.split("_")[1] for key in request.POST if key.startswith("reps_")}
+        if not submitted_ids <= item_ids:
+            messages.error(
+                request,
+                "Today's workout plan changed while you were filling it in. Please enter your sets again.",
+            )
+            return redirect("today_workout")
+
+        # Validate every reps input first, so a bad value leaves the DB untouched
+        entries = []
+        for item_id, prescribed_sets, exercise_name in items_data:
+            # Field names are reps_<itemid>_<setnum> / comment_<itemid>_<setnum>
+            reps_prefix = f"reps_{item_id}_"
+            comment_prefix = f"comment_{item_id}_"
+            for set_num in range(1, prescribed_sets + 1):
+                set_suffix = str(set_num)
+                reps_key = reps_prefix + set_suffix
+                comment_key = comment_prefix + set_suffix
 
                 reps_raw = (request.POST.get(reps_key) or "").strip()
                 comment_raw = (request.POST.get(comment_key) or "").strip()
@@ -59,28 +76,73 @@ def today_workout(request):
                     # If non-integer input is entered, show error and don't save this submission
                     messages.error(
                         request,
-                        f"Invalid reps/time value '{reps_raw}' for {item.exercise.name} set {set_num}. "
+                        f"Invalid reps/time value '{reps_raw}' for {exercise_name} set {set_num}. "
                         f"Please enter a whole number (e.g., 10 or 60).",
                     )
                     return redirect("today_workout")
 
-                SetLog.objects.create(
+                entries.append((item_id, set_num, reps_done, comment_raw))
+
+        # General comment for the whole workout
+        general_comment = request.POST.get("general_comment", "").strip()
+
+        with transaction.atomic():
+            # Create the log (with its comment) if it's the first submission
+            created = log is None
+            if created:
+                log = WorkoutLog.objects.create(
+                    user=request.user, plan=plan, general_comment=general_comment
+                )
+
+            set_logs = [
+                SetLog(
                     log=log,
-                    plan_item=item,
+                    plan_item_id=item_id,
                     set_number=set_num,
                     reps_done=reps_done,
-                    comment=comment_raw,
+                    comment=comment,
                 )
+                for item_id, set_num, reps_done, comment in entries
+            ]
+
+            # Upsert all sets in a single round-trip: existing sets are updated in place
+            SetLog.objects.bulk_create(
+                set_logs,
+                batch_size=200,
+                update_conflicts=True,
+                unique_fields=["log", "plan_item", "set_number"],
+                update_fields=["reps_done", "comment"],
+            )
+
+            if not created:
+                # Drop sets the user cleared since the previous submit
+                kept_ids = [s.pk for s in set_logs]
+                SetLog.objects.filter(log=log).exclude(pk__in=kept_ids).delete()
+
+                # Save the general comment last, as a single UPDATE
+                WorkoutLog.objects.filter(pk=log.pk).update(general_comment=general_comment)
 
         messages.success(request, "Workout saved successfully!")
         return redirect("today_workout")
 
+    # Items are the exercises inside the plan, ordered by 'order' (served from the prefetch cache)
+    items = plan.items.all()
+
     # Build initial values if a log already exists (so user sees what was saved)
     initial = {}
     if log:
-        for s in SetLog.objects.select_related("plan_item", "plan_item__exercise").filter(log=log):
-            initial[f"reps_{s.plan_item_id}_{s.set_number}"] = s.reps_done
-            initial[f"comment_{s.plan_item_id}_{s.set_number}"] = s.comment or ""
+        # Only IDs and values are needed here, so skip joins and model instances.
+        # Clearing the default ordering avoids a JOIN on plan_item just to sort,
+        # and iterator() streams rows from the cursor instead of caching them all.
+        set_values = (
+            SetLog.objects.filter(log=log)
+            .order_by()
+            .values_list("plan_item_id", "set_number", "reps_done", "comment")
+            .iterator(chunk_size=100)
+        )
+        for plan_item_id, set_number, reps_done, comment in set_values:
+            initial[f"reps_{plan_item_id}_{set_number}"] = reps_done
+            initial[f"comment_{plan_item_id}_{set_number}"] = comment or ""
 
     context = {
         "today": today,